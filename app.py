@@ -10,6 +10,7 @@ from utils.logging import configure_logging
 from routes.base import base
 from routes.groupme import groupme
 from routes.send import send
+from rabbitmq.consumer import start_consumer_thread
 
 logging.root.handlers = []
 logger = configure_logging()
@@ -27,4 +28,7 @@ if not GROUPME_BOT_ID or not GROUPME_ACCESS_TOKEN:
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=APP_PORT)
+    # Under Gunicorn the consumer is started in `post_fork` (see gunicorn_config.py).
+    # When run directly, start it here so it runs alongside the HTTP endpoints.
+    start_consumer_thread()
+    app.run(host="0.0.0.0", port=int(APP_PORT), threaded=True)
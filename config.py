@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
 APP_PORT = os.getenv("APP_PORT", "2000")
 APP_PASSWORD = os.getenv("APP_PASSWORD")
 GROUPCHAT_NAME = os.getenv("GROUPCHAT_NAME", "WBOR MGMT")
@@ -19,20 +20,29 @@ RABBITMQ_DL_EXCHANGE = os.getenv("RABBITMQ_DL_EXCHANGE", "dead_letter_exchange")
 ACK_URL = os.getenv("ACK_URL", "http://wbor-twilio:5000/acknowledge")
 TWILIO_SOURCE = os.getenv("TWILIO_SOURCE", "twilio")
 
+# Acknowledgments are flushed once this many messages have been processed, or after
+# this many seconds, whichever comes first. Also used as the consumer prefetch count.
+CONSUMER_BATCH_SIZE = max(1, int(os.getenv("CONSUMER_BATCH_SIZE", "10")))
+CONSUMER_BATCH_TIMEOUT = float(os.getenv("CONSUMER_BATCH_TIMEOUT", "1.0"))
+
 GROUPME_BOT_ID = os.getenv("GROUPME_BOT_ID")
 GROUPME_ACCESS_TOKEN = os.getenv("GROUPME_ACCESS_TOKEN")
 GROUPME_CHARACTER_LIMIT = abs(int(os.getenv("GROUPME_CHARACTER_LIMIT", "900")))
+# Longer messages are truncated rather than sent as an unbounded number of segments
+GROUPME_MAX_SEGMENTS = max(1, int(os.getenv("GROUPME_MAX_SEGMENTS", "20")))
 
 GROUPME_API = "https://api.groupme.com/v3/bots/post"
 GROUPME_IMAGE_API = "https://image.groupme.com/pictures"
 
 
 # Routing keys we don't want to deal with globally
-GLOBAL_BLOCKLIST = [
-    "source.twilio.sms.outgoing",
-    "source.twilio.call-events",
-    "source.twilio.voice-intelligence",
-]
-
-# The /send endpoint should not allow messages if the `source` is in this list
-SEND_BLOCKLIST = ["twilio"]
+GLOBAL_BLOCKLIST = frozenset(
+    {
+        "source.twilio.sms.outgoing",
+        "source.twilio.call-events",
+        "source.twilio.voice-intelligence",
+    }
+)
+
+# The /send endpoint should not allow messages if the `source` is in this set
+SEND_BLOCKLIST = frozenset({"twilio"})
@@ -58,8 +58,7 @@ class MessageSourceHandler:
 
         # Split and send text segments
         if body:
-            segments = GroupMe.split_message(body)
-            GroupMe.send_text_segments(segments, source, uid, len(groupme_images))
+            GroupMe.send_text_segments(body, source, uid, len(groupme_images))
 
         if groupme_images:
             GroupMe.send_images(groupme_images, source, uid, body)
@@ -72,9 +71,8 @@ class MessageSourceHandler:
                         "A media item was sent with an unsupported format.\n\n"
                         "Check the message in Twilio logs for details.\n"
                         "---UID---\n"
-                        "%s\n"
-                        "---------",
-                        uid,
+                        f"{GroupMe.abbreviate_uid(uid)}\n"
+                        "---------"
                     )
                 },
                 source,
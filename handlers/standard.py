@@ -75,8 +75,8 @@ class StandardHandler(MessageSourceHandler):
         images = message.get("images")
         groupme_images = []
         if images:
-            for image_url in images:
-                upload_response = GroupMe.upload_image(image_url, source, uid)
+            upload_responses = GroupMe.upload_images_bulk(images, source, uid)
+            for image_url, upload_response in zip(images, upload_responses):
                 if upload_response is not None:
                     image_url = upload_response.get("payload", {}).get("url")
                     if image_url:
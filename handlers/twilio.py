@@ -95,18 +95,17 @@ class TwilioHandler(MessageSourceHandler):
         """
         unsupported_type = False
         groupme_images = []
-        for i in range(10):
-            media_url_key = f"MediaUrl{i}"
-            if media_url_key in message:
-                upload_response = GroupMe.upload_image(
-                    message[media_url_key], source, uid
-                )
-                if upload_response is not None:
-                    image_url = upload_response.get("payload", {}).get("url")
-                    if image_url:
-                        groupme_images.append(image_url)
-                        logger.info("Image uploaded for: %s: %s", uid, image_url)
-                else:
-                    logger.warning("Failed to upload media: %s", message[media_url_key])
-                    unsupported_type = True
+        media_urls = [
+            message[f"MediaUrl{i}"] for i in range(10) if f"MediaUrl{i}" in message
+        ]
+        upload_responses = GroupMe.upload_images_bulk(media_urls, source, uid)
+        for media_url, upload_response in zip(media_urls, upload_responses):
+            if upload_response is not None:
+                image_url = upload_response.get("payload", {}).get("url")
+                if image_url:
+                    groupme_images.append(image_url)
+                    logger.info("Image uploaded for: %s: %s", uid, image_url)
+            else:
+                logger.warning("Failed to upload media: %s", media_url)
+                unsupported_type = True
         return groupme_images, unsupported_type
@@ -5,17 +5,21 @@ accordingly as defined in the message handlers within the callback function.
 
 import time
 import sys
+import logging
+import random
+import threading
+from functools import partial
 import pika
-from pika.exceptions import AMQPConnectionError
+from pika.exceptions import AMQPConnectionError, AMQPError
 from utils.logging import configure_logging
 from config import (
-    RABBITMQ_HOST,
-    RABBITMQ_USER,
-    RABBITMQ_PASS,
     RABBITMQ_EXCHANGE,
+    CONSUMER_BATCH_SIZE,
+    CONSUMER_BATCH_TIMEOUT,
 )
 from .util import (
     assert_exchange,
+    get_connection_parameters,
     process_message_body,
     parse_routing_key,
     generate_message_id,
@@ -27,6 +31,57 @@ from .handlers import MESSAGE_HANDLERS, SOURCES
 logger = configure_logging(__name__)
 
 
+class BatchAcknowledger:
+    """
+    Defer message acknowledgments and flush them as a single `multiple=True` ack.
+
+    Delivery tags are per-channel and monotonically increasing, so acking the most recent tag
+    with `multiple=True` settles every outstanding delivery up to it. Messages that were already
+    nacked individually are no longer outstanding and are unaffected.
+    """
+
+    def __init__(self, connection, channel, batch_size, batch_timeout):
+        self.connection = connection
+        self.channel = channel
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.last_tag = None
+        self.pending = 0
+        self.timer = None
+
+    def ack(self, delivery_tag):
+        """
+        Queue a delivery tag for acknowledgment.
+
+        Flushes immediately once `batch_size` acks are pending; otherwise a timer guarantees
+        the batch is flushed within `batch_timeout` seconds.
+        """
+        self.last_tag = delivery_tag
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = self.connection.call_later(self.batch_timeout, self.flush)
+
+    def flush(self):
+        """
+        Acknowledge all pending deliveries in one frame.
+        """
+        if self.timer is not None:
+            self.connection.remove_timeout(self.timer)
+            self.timer = None
+        if self.last_tag is None:
+            return
+        self.channel.basic_ack(delivery_tag=self.last_tag, multiple=True)
+        logger.debug(
+            "Acknowledged %d message(s) up to delivery tag %s",
+            self.pending,
+            self.last_tag,
+        )
+        self.last_tag = None
+        self.pending = 0
+
+
 def validate_message_fields(message, method, ch):
     """
     Ensure that the message has the required fields and meets conditions.
@@ -51,21 +106,23 @@ def validate_message_fields(message, method, ch):
         ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
         return False
 
+    # Look each field up once
+    twilio_sender = message.get("From")
+    twilio_body = message.get("Body")
+    media_url = message.get("MediaUrl0")
+    uid = message.get("wbor_message_id")
+
     # Check sender (Twilio or standard source)
-    sender = message.get("From") or message.get("source")
+    sender = twilio_sender or message.get("source")
     if not sender:
         return nack_message("Missing sender field in message: %s")
 
     # Check Twilio-specific constraints
-    if message.get("From"):
-        body = message.get("Body")
-        media_url = message.get("MediaUrl0")
-        if not body and not media_url:
-            return nack_message("Empty Twilio message body without media URL: %s")
+    if twilio_sender and not twilio_body and not media_url:
+        return nack_message("Empty Twilio message body without media URL: %s")
 
     # Check for the message body or media URL
-    message_body = message.get("body") or message.get("Body")
-    media_url = message.get("MediaUrl0")
+    message_body = message.get("body") or twilio_body
     if not message_body and not media_url:
         return nack_message("Message must have a body or a media URL: %s")
 
@@ -75,39 +132,35 @@ def validate_message_fields(message, method, ch):
             "Received and validated message from `%s`: %s - UID: %s",
             sender,
             message_body,
-            message.get("wbor_message_id"),
+            uid,
         )
     else:
         logger.info(
             "Received and validated media message from `%s`: %s",
             sender,
-            message.get("wbor_message_id"),
+            uid,
         )
     return True
 
 
-def process_message_handler(message, handler_key, subkey, alreadysent):
+def process_message_handler(handler, message, subkey, alreadysent):
     """
-    Processes an incoming message by determining the appropriate handler based on the routing key.
+    Processes an incoming message with the handler determined from its routing key.
 
     Parameters:
+    - handler (MessageSourceHandler): The handler for the message's source.
     - message (dict): The message payload to be processed.
-    - method (pika.spec.Basic.Deliver): The delivery method containing the routing key.
+    - subkey (str): The routing key's subkey (e.g. "sms.incoming").
     - alreadysent (bool): A flag indicating whether the message has already been sent.
         - e.g. the message was sent to GroupMe by the producer's API interaction
 
     Returns:
     - The result of the handler's process_message().
     """
-    # Determine and invoke the appropriate handle
-    # NOTE that the routing key[1] is the same as the body source field
-    logger.debug("Handler query provided: `%s`", handler_key)
-
-    handler = MESSAGE_HANDLERS[handler_key]
     return handler.process_message(message, subkey, alreadysent)
 
 
-def callback(ch, method, properties, body):
+def callback(ch, method, properties, body, acker=None):
     """
     Actually process the messages being consumed from the queue.
 
@@ -120,21 +173,25 @@ def callback(ch, method, properties, body):
 
     Parameters:
     - body: The message body
+    - acker (BatchAcknowledger, optional): Batches successful acks. If not provided, each
+        message is acknowledged individually.
 
     Returns:
     - None
 
     Throws:
-    - json.JSONDecodeError: If the message body is not valid JSON
+    - orjson.JSONDecodeError: If the message body is not valid JSON
     - KeyError: If the message body is missing required keys
     """
     try:
         message = process_message_body(body)
-        logger.debug(
-            "Received message (w/ routing key `%s`), JSON: %s",
-            method.routing_key,
-            message,
-        )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(
+                "Received message (w/ routing key `%s`), JSON: %s",
+                method.routing_key,
+                message,
+            )
 
         handler_key, subkey, key_blocked = parse_routing_key(method.routing_key)
         if key_blocked:
@@ -145,29 +202,39 @@ def callback(ch, method, properties, body):
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
             return
 
-        # Ensure the message has the required fields
-        if not validate_message_fields(message, method, ch):
+        # Determine the appropriate handler
+        # NOTE that the routing key[1] is the same as the body source field
+        if debug:
+            logger.debug("Handler query provided: `%s`", handler_key)
+        handler = MESSAGE_HANDLERS.get(handler_key)
+        if handler is None:
+            logger.warning(
+                "No handler for routing key `%s`. Message rejected (not requeueing).",
+                method.routing_key,
+            )
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
             return
 
+        # Ensure the message has the required fields (nacks the message if not)
+        if not validate_message_fields(message, method, ch):
+            return
+
         alreadysent = properties.headers.get("alreadysent", False)
         sanitize_message(message, alreadysent)
-        generate_message_id(message)  # Append a message ID if it doesn't exist already
+        # Append a message ID if it doesn't exist already
+        uid = generate_message_id(message)
 
         # Routes the message to the correct handler based on its routing key
-        if process_message_handler(message, handler_key, subkey, alreadysent):
+        if process_message_handler(handler, message, subkey, alreadysent):
             # Send a message acknowledgment, if applicable
             handle_acknowledgment(message, properties)
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            logger.info(
-                "Message processed, logged, and acknowledged: %s",
-                message.get("wbor_message_id"),
-            )
+            if acker:
+                acker.ack(method.delivery_tag)
+            else:
+                ch.basic_ack(delivery_tag=method.delivery_tag)
+            logger.info("Message processed, logged, and acknowledged: %s", uid)
         else:
-            logger.warning(
-                "Message processing failed (not requeueing): %s",
-                message.get("wbor_message_id"),
-            )
+            logger.warning("Message processing failed (not requeueing): %s", uid)
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
     except KeyError as e:
         logger.error("KeyError during message processing (not requeueing): %s", e)
@@ -182,19 +249,26 @@ def consume_messages():
     Binds the queue to the EXCHANGE and starts consuming messages via callback.
 
     The callback function processes the message and acknowledges it if successful.
+    Acknowledgments are batched (see `BatchAcknowledger`), and the prefetch count is capped at
+    the batch size so the broker never has more than one batch in flight. Pending acks are
+    flushed whenever consuming stops, including when a callback raises.
+
+    Reconnect attempts back off exponentially (capped at 60 seconds) with jitter, so replicas
+    don't reconnect in lockstep after a broker outage.
     """
+    backoff = 1.0
     while True:
         logger.debug("Attempting to connect to RabbitMQ...")
-        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-        parameters = pika.ConnectionParameters(
-            host=RABBITMQ_HOST,
-            credentials=credentials,
-            client_properties={"connection_name": "GroupMeConsumerConnection"},
-        )
         try:
-            connection = pika.BlockingConnection(parameters)
+            connection = pika.BlockingConnection(
+                get_connection_parameters("GroupMeConsumerConnection")
+            )
             channel = connection.channel()
             assert_exchange(channel)
+            channel.basic_qos(prefetch_count=CONSUMER_BATCH_SIZE)
+            acker = BatchAcknowledger(
+                connection, channel, CONSUMER_BATCH_SIZE, CONSUMER_BATCH_TIMEOUT
+            )
 
             # Declare and bind queues dynamically
             for source, routing_key in SOURCES.items():
@@ -214,13 +288,23 @@ def consume_messages():
                 )
                 channel.basic_consume(
                     queue=queue_name,
-                    on_message_callback=callback,
+                    on_message_callback=partial(callback, acker=acker),
                     auto_ack=False,
                     consumer_tag=f"{source}_consumer",
                 )
 
             logger.info("Connected to RabbitMQ & queues bound. Now consuming...")
-            channel.start_consuming()
+            backoff = 1.0
+            try:
+                channel.start_consuming()
+            finally:
+                # Settle acks held for already-processed messages before unwinding, otherwise
+                # they're redelivered (and posted to GroupMe again)
+                if channel.is_open:
+                    try:
+                        acker.flush()
+                    except AMQPError as e:
+                        logger.warning("Failed to flush pending acknowledgments: %s", e)
         except AMQPConnectionError as conn_error:
             error_message = str(conn_error)
             if "CONNECTION_FORCED" in error_message and "shutdown" in error_message:
@@ -233,8 +317,25 @@ def consume_messages():
                     "RabbitMQ access refused. Check user permissions. Shutting down consumer."
                 )
                 sys.exit(1)
+            delay = min(backoff, 60.0) + random.uniform(0, 1)
             logger.error(
-                "(Retrying in 5 seconds) Failed to connect to RabbitMQ: %s",
+                "(Retrying in %.1f seconds) Failed to connect to RabbitMQ: %s",
+                delay,
                 error_message,
             )
-            time.sleep(5)
+            time.sleep(delay)
+            backoff *= 2
+
+
+def start_consumer_thread():
+    """
+    Run `consume_messages` on a daemon thread alongside the Flask app.
+
+    Returns:
+    - threading.Thread: The started consumer thread
+    """
+    consumer_thread = threading.Thread(
+        target=consume_messages, daemon=True, name="ConsumerThread"
+    )
+    consumer_thread.start()
+    return consumer_thread
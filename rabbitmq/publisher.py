@@ -2,28 +2,134 @@
 RabbitMQ Publisher module.
 """
 
-import json
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import pika
 import pika.exceptions
 from utils.logging import configure_logging
 from config import (
-    RABBITMQ_HOST,
-    RABBITMQ_USER,
-    RABBITMQ_PASS,
     RABBITMQ_EXCHANGE,
     GROUPME_BOT_ID,
 )
-from rabbitmq.util import assert_exchange
+from rabbitmq.util import assert_exchange, get_connection_parameters
 
 
 logger = configure_logging(__name__)
 
+# Properties for publishes without extra headers; shared since pika only reads them
+_DEFAULT_PROPERTIES = pika.BasicProperties(
+    headers={"x-retry-count": 0},  # Initialize retry count for other consumers
+    delivery_mode=2,  # Make the message persistent
+)
+
+
+class _PublisherState:
+    """
+    A long-lived connection and channel for one named publisher connection.
+
+    If `confirm` is set, the channel is put in publisher-confirm mode, so `basic_publish` only
+    returns once the broker has taken responsibility for the message (and raises `NackError`
+    otherwise). Non-critical publishers (e.g. logs) skip confirms to avoid the round-trip.
+
+    Access is serialized through `lock` since pika's BlockingConnection is not thread-safe and
+    Flask requests may publish concurrently with the consumer thread.
+    """
+
+    def __init__(self, connection_name, confirm):
+        self.connection_name = connection_name
+        self.confirm = confirm
+        self.connection = None
+        self.channel = None
+        self.lock = threading.Lock()
+
+    def get_channel(self):
+        """
+        Return the open channel, (re)connecting first if necessary.
+        """
+        if self.channel is not None and self.channel.is_open:
+            # Service heartbeats and surface a connection the broker has since closed
+            self.connection.process_data_events(time_limit=0)
+            return self.channel
+
+        self.reset()
+        logger.debug("Connecting to RabbitMQ as `%s`...", self.connection_name)
+        self.connection = pika.BlockingConnection(
+            get_connection_parameters(self.connection_name)
+        )
+        self.channel = self.connection.channel()
+        assert_exchange(self.channel)
+        if self.confirm:
+            self.channel.confirm_delivery()
+        logger.debug("RabbitMQ connected! Ready to publish messages.")
+        return self.channel
+
+    def publish(self, routing_key, body, properties):
+        """
+        Publish to the exchange over the kept-open channel.
+
+        If the connection has gone stale since the last publish, reconnect and retry once.
+        """
+        with self.lock:
+            try:
+                self.get_channel().basic_publish(
+                    exchange=RABBITMQ_EXCHANGE,
+                    routing_key=routing_key,
+                    body=body,
+                    properties=properties,
+                )
+            except pika.exceptions.NackError:
+                raise  # The broker is reachable; it refused the message
+            except (
+                pika.exceptions.AMQPConnectionError,
+                pika.exceptions.AMQPChannelError,
+            ) as e:
+                logger.warning("Publisher connection lost, reconnecting: %s", e)
+                self.reset()
+                self.get_channel().basic_publish(
+                    exchange=RABBITMQ_EXCHANGE,
+                    routing_key=routing_key,
+                    body=body,
+                    properties=properties,
+                )
+
+    def reset(self):
+        """
+        Drop the current connection (if any) so the next publish reconnects.
+        """
+        if self.connection is not None and self.connection.is_open:
+            try:
+                self.connection.close()
+            except pika.exceptions.AMQPError:
+                pass
+        self.connection = None
+        self.channel = None
+
+
+_PUBLISHERS = {}
+_PUBLISHERS_LOCK = threading.Lock()
+
+
+def _get_publisher(connection_name, confirm):
+    """
+    Get (or lazily create) the publisher state for a connection name.
+    """
+    with _PUBLISHERS_LOCK:
+        state = _PUBLISHERS.get(connection_name)
+        if state is None:
+            state = _PUBLISHERS[connection_name] = _PublisherState(
+                connection_name, confirm
+            )
+        return state
+
 
 def publish_message(
     request_body,
     routing_key,
     connection_name="GroupMePublisherConnection",
     extra_properties=None,
+    confirm=True,
 ):
     """
     Publish a message to RabbitMQ.
@@ -34,6 +140,8 @@ def publish_message(
         - e.g. `standard` from /send
     - connection_name (str): RabbitMQ connection name (default: "GroupMePublisherConnection")
     - extra_properties (dict, optional): Additional properties for the message (e.g., headers)
+    - confirm (bool): Wait for a publisher confirm from the broker (default: True).
+        Only honored the first time a given `connection_name` is used.
 
     Returns:
     - None
@@ -43,75 +151,50 @@ def publish_message(
     routing_key = f"source.{routing_key}"
 
     try:
-        logger.debug("Connecting to RabbitMQ...")
-        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-        parameters = pika.ConnectionParameters(
-            host=RABBITMQ_HOST,
-            credentials=credentials,
-            client_properties={"connection_name": connection_name},
-        )
-        connection = pika.BlockingConnection(parameters)
-        channel = connection.channel()
-        logger.debug("RabbitMQ connected! Ready to publish message.")
-        assert_exchange(channel)
-
         logger.debug(
             "Attempting to publish message with routing key: `%s`", routing_key
         )
-        properties = pika.BasicProperties(
-            headers={"x-retry-count": 0},  # Initialize retry count for other consumers
-            delivery_mode=2,  # Make the message persistent
-        )
         if extra_properties:
-            properties.headers.update(extra_properties)
+            properties = pika.BasicProperties(
+                headers={"x-retry-count": 0, **extra_properties},
+                delivery_mode=2,
+            )
+        else:
+            properties = _DEFAULT_PROPERTIES
+        message_body = orjson.dumps(request_body)
 
-        channel.basic_publish(
-            exchange=RABBITMQ_EXCHANGE,
-            routing_key=routing_key,
-            body=json.dumps(request_body).encode(),
-            properties=properties,
+        _get_publisher(connection_name, confirm).publish(
+            routing_key, message_body, properties
         )
 
-        stripped = False
-        # Strip `raw_img` from request body for logging
-        if request_body.get("raw_img"):
-            request_body.pop("raw_img")
-            stripped = True
-
-        if not stripped:
-            if request_body.get("type") == "log":
-                logger.info(
-                    "Log message published with routing key `%s`: %s",
-                    routing_key,
-                    request_body,
-                )
-            else:
-                logger.info(
-                    "Message published with routing key `%s`: %s",
-                    routing_key,
-                    request_body,
-                )
+        if request_body.get("type") == "log":
+            logger.info(
+                "Log message published with routing key `%s`: %s",
+                routing_key,
+                request_body,
+            )
         else:
-            if request_body.get("type") == "log":
-                logger.info(
-                    "Log message published with routing key `%s`: %s (stripped `raw_img`)",
-                    routing_key,
-                    request_body,
-                )
-            else:
-                logger.info(
-                    "Message published with routing key `%s`: %s (stripped `raw_img`)",
-                    routing_key,
-                    request_body,
-                )
-        connection.close()
-    except pika.exceptions.AMQPConnectionError as e:
+            logger.info(
+                "Message published with routing key `%s`: %s",
+                routing_key,
+                request_body,
+            )
+    except pika.exceptions.NackError as e:
+        logger.error(
+            'Broker rejected message published with routing key "%s": %s',
+            routing_key,
+            e,
+        )
+    except (
+        pika.exceptions.AMQPConnectionError,
+        pika.exceptions.AMQPChannelError,
+    ) as e:
         logger.error(
             'Connection error when publishing to exchange with routing key "%s": %s',
             routing_key,
             e,
         )
-    except json.JSONDecodeError as e:
+    except orjson.JSONEncodeError as e:
         logger.error("JSON encoding error for message %s: %s", request_body, e)
 
 
@@ -119,6 +202,10 @@ def publish_log_pg(body, source, statuscode, uid, routing_key="groupme", sub_key
     """
     Log message actions in Postgres by publishing to the RabbitMQ exchange.
 
+    The entry is built immediately (so later changes to `body` don't affect it), but published
+    in the background so the caller doesn't wait on the broker. If `_MAX_PENDING_LOGS` entries
+    are already waiting (e.g. during a broker outage), the entry is dropped with a warning.
+
     `groupme.img` are image service API calls, whereas,
     `groupme.msg` are GroupMe message service API calls.
 
@@ -131,6 +218,8 @@ def publish_log_pg(body, source, statuscode, uid, routing_key="groupme", sub_key
     - routing_key (str): The routing key for the body, defaults to "groupme"
     - sub_key (str): The sub-key for the body, defaults to "log"
     """
+    global _dropped_logs
+
     if not isinstance(body, dict):
         logger.error("Invalid body type for publish_log_pg: %s", type(body))
         return
@@ -140,14 +229,67 @@ def publish_log_pg(body, source, statuscode, uid, routing_key="groupme", sub_key
     if not body.get("bot_id"):
         body["bot_id"] = GROUPME_BOT_ID
 
+    request_body = {
+        **body,
+        "source": source,
+        "code": statuscode,
+        "type": sub_key,
+        "wbor_message_id": uid,
+    }
+
+    # Bound the backlog so a broker outage can't queue log entries without limit
+    if not _LOG_BACKLOG.acquire(blocking=False):
+        with _DROPPED_LOGS_LOCK:
+            _dropped_logs += 1
+            first_drop = _dropped_logs == 1
+        if first_drop:
+            logger.warning(
+                "Log backlog is full (%d entries); dropping log entries until it drains",
+                _MAX_PENDING_LOGS,
+            )
+        return
+
+    with _DROPPED_LOGS_LOCK:
+        dropped, _dropped_logs = _dropped_logs, 0
+    if dropped:
+        logger.warning("Log backlog drained; %d log entries were dropped", dropped)
+
+    future = _LOG_POOL.submit(_publish_log, request_body, routing_key)
+    future.add_done_callback(_on_log_published)
+
+
+def _publish_log(request_body, routing_key):
+    """
+    Publish a log entry built by `publish_log_pg`.
+    """
     publish_message(
-        request_body={
-            **body,
-            "source": source,
-            "code": statuscode,
-            "type": sub_key,
-            "wbor_message_id": uid,
-        },
+        request_body=request_body,
         routing_key=routing_key,
         connection_name="GroupMeLogPublisherConnection",
+        confirm=False,  # Logs are fire-and-forget
     )
+
+
+def _on_log_published(future):
+    """
+    Free the entry's backlog slot, and log any error the background publish raised (which
+    would otherwise be lost with the discarded future).
+    """
+    _LOG_BACKLOG.release()
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("Failed to publish log entry: %r", error, exc_info=error)
+
+
+# Log publishes happen in the background so callers don't wait on the broker. Logs share one
+# connection, so a single worker is enough (and keeps them in order).
+_LOG_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gm-log")
+atexit.register(_LOG_POOL.shutdown, wait=True)
+
+# Most log entries allowed to wait for the worker at once; further entries are dropped
+_MAX_PENDING_LOGS = 1000
+_LOG_BACKLOG = threading.BoundedSemaphore(_MAX_PENDING_LOGS)
+_dropped_logs = 0
+_DROPPED_LOGS_LOCK = threading.Lock()
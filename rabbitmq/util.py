@@ -2,7 +2,10 @@
 RabbitMQ utility functions.
 """
 
-import json
+import re
+import logging
+from functools import lru_cache
+import orjson
 import pika
 from pika.exceptions import AMQPConnectionError, AMQPChannelError
 from utils.logging import configure_logging
@@ -17,14 +20,17 @@ from config import (
 
 logger = configure_logging(__name__)
 
+# Anything other than printable ASCII, tabs, and newlines may need sanitizing
+_MAY_NEED_SANITIZING = re.compile(r"[^\t\n\x20-\x7e]")
+
 
 def process_message_body(body):
     """
     Load the raw message body as JSON.
     """
     try:
-        return json.loads(body)
-    except json.JSONDecodeError as e:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
         logger.error("Invalid JSON message body: %s", e)
         raise
 
@@ -34,19 +40,26 @@ def sanitize_message(message, alreadysent):
     Strip unprintable characters from the message body.
 
     Preserve capitalization of the `Body` field for Twilio message logging downstream.
+
+    Bodies made up only of printable characters (plus tabs and newlines) are left untouched,
+    skipping the character-by-character pass in `MessageUtils.sanitize_string`.
     """
     # Sanitize the message body only if it hasn't been sent yet
     if alreadysent:
         return
 
-    original_body = message.get("Body") or message.get("body")
+    twilio_body = message.get("Body")
+    body_key = "body" if twilio_body is None else "Body"
+    original_body = twilio_body or message.get("body")
+    if not isinstance(original_body, str):
+        return
+    if original_body.isprintable() or not _MAY_NEED_SANITIZING.search(original_body):
+        return
+
     sanitized_body = MessageUtils.sanitize_string(original_body)
-    if original_body != sanitized_body:
+    if original_body != sanitized_body and logger.isEnabledFor(logging.DEBUG):
         logger.debug("Sanitized message body: %s -> %s", original_body, sanitized_body)
-    if "Body" in message:
-        message["Body"] = sanitized_body
-    else:
-        message["body"] = sanitized_body
+    message[body_key] = sanitized_body
 
 
 def parse_routing_key(routing_key):
@@ -65,9 +78,9 @@ def parse_routing_key(routing_key):
     - key_blocked (bool): Whether the routing key is in the blocklist.
     """
     # Example incoming routing key: "source.twilio.sms.incoming"
-    parts = routing_key.split(".")
-    handler_key = parts[1]  # e.g., "twilio" or "standard"
-    subkey = ".".join(parts[2:])  # e.g., "sms.incoming"
+    parts = routing_key.split(".", 2)
+    handler_key = parts[1] if len(parts) > 1 else ""  # e.g., "twilio" or "standard"
+    subkey = parts[2] if len(parts) > 2 else ""  # e.g., "sms.incoming"
     key_blocked = routing_key in GLOBAL_BLOCKLIST
     return handler_key, subkey, key_blocked
 
@@ -75,9 +88,35 @@ def parse_routing_key(routing_key):
 def generate_message_id(message):
     """
     If a message ID is not provided, generate a local UUID for it.
+
+    Returns:
+    - str: The message ID
+    """
+    uid = message.get("wbor_message_id")
+    if not uid:
+        uid = message["wbor_message_id"] = MessageUtils.gen_uuid()
+    return uid
+
+
+@lru_cache(maxsize=None)
+def get_connection_parameters(connection_name=None):
     """
-    if not message.get("wbor_message_id"):
-        message["wbor_message_id"] = MessageUtils.gen_uuid()
+    Build (once per connection name) the parameters used to connect to RabbitMQ.
+
+    Parameters:
+    - connection_name (str, optional): Name shown for the connection in the RabbitMQ UI
+
+    Returns:
+    - pika.ConnectionParameters: The connection parameters
+    """
+    client_properties = (
+        {"connection_name": connection_name} if connection_name else None
+    )
+    return pika.ConnectionParameters(
+        host=RABBITMQ_HOST,
+        credentials=pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS),
+        client_properties=client_properties,
+    )
 
 
 def assert_exchange(channel, exchange_name=RABBITMQ_EXCHANGE):
@@ -98,20 +137,15 @@ def send_acknowledgment(message, reply_to, correlation_id):
     Send an acknowledgment message to the reply_to queue.
     """
     try:
-        credentials = pika.PlainCredentials(RABBITMQ_USER, RABBITMQ_PASS)
-        parameters = pika.ConnectionParameters(
-            host=RABBITMQ_HOST,
-            credentials=credentials,
-        )
-        connection = pika.BlockingConnection(parameters)
+        connection = pika.BlockingConnection(get_connection_parameters())
         channel = connection.channel()
 
         channel.basic_publish(
             exchange="",  # No exchange, direct queue routing
             routing_key=reply_to,
-            body=json.dumps(
+            body=orjson.dumps(
                 {"status": "success", "message_id": message["wbor_message_id"]}
-            ).encode(),
+            ),
             properties=pika.BasicProperties(correlation_id=correlation_id),
         )
 
@@ -2,6 +2,7 @@
 Send message module.
 """
 
+import orjson
 from flask import Blueprint, request
 from utils.message import MessageUtils
 from utils.logging import configure_logging
@@ -13,6 +14,9 @@ logger = configure_logging(__name__)
 
 send = Blueprint("send", __name__)
 
+_REQUIRED_FIELDS = frozenset({"body", "source"})
+_ALLOWED_FIELDS = _REQUIRED_FIELDS | {"images", "wbor_message_id"}
+
 
 @send.route("/send", methods=["POST"])
 def send_message():
@@ -44,7 +48,14 @@ def send_message():
     - str: "Bad Request" if the request body is missing required fields
     - str: "Internal Server Error" if the message failed to send
     """
-    body = request.json
+    try:
+        body = orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError as e:
+        logger.error("Bad Request: Invalid JSON body: %s", e)
+        return "Bad Request"
+    if not isinstance(body, dict):
+        logger.error("Bad Request: JSON body must be an object")
+        return "Bad Request"
 
     # Ensure `password` is present and correct
     if body.get("password") != APP_PASSWORD:
@@ -58,8 +69,7 @@ def send_message():
     logger.info("Send callback received: %s", body)
 
     # Check required fields
-    required_fields = ["body", "source"]
-    missing_fields = [field for field in required_fields if field not in body]
+    missing_fields = _REQUIRED_FIELDS - body.keys()
     if missing_fields:
         logger.error("Bad Request: Missing required fields: %s", missing_fields)
         return "Bad Request"
@@ -76,13 +86,8 @@ def send_message():
         return "Bad Request"
 
     # Ensure any other fields are either `images` or `wbor_message_id`
-    allowed_optional_fields = ["images", "wbor_message_id"]
-    extra_fields = [
-        field
-        for field in body.keys()
-        if field not in required_fields + allowed_optional_fields
-    ]
-    if extra_fields and extra_fields not in ["images", "wbor_message_id"]:
+    extra_fields = body.keys() - _ALLOWED_FIELDS
+    if extra_fields:
         logger.error("Unexpected fields: %s", extra_fields)
         return "Bad Request"
 
@@ -5,6 +5,86 @@ A class to parse and execute GroupMe admin commands.
 from utils.groupme import GroupMe
 from utils.admin import ban, get_stats
 
+_HELP_TEXT = (
+    "Available commands:\n"
+    "!help - Display this help message\n"
+    "!ping - Check if the bot is online\n"
+    "!ban <UID> - Ban a phone number from sending messages\n"
+    "!unban <UID> - Unban a phone number from sending messages\n"
+    "!stats <UID> - Display message statistics for a phone number"
+)
+
+_UNKNOWN_TEXT = "Unknown command.\n\nType `!help` to see a list of available commands."
+
+
+def _reply(text):
+    """Send a command response to the group chat."""
+    GroupMe.send_to_groupme({"text": text}, source="command_parser")
+
+
+def _cmd_help(_uid_arg):
+    """Display the list of available commands."""
+    _reply(_HELP_TEXT)
+
+
+def _cmd_ping(uid_arg):
+    """Check if the bot is online."""
+    _reply(f"Pong! UID: {uid_arg}")
+
+
+def _cmd_ban(uid_arg):
+    """Ban the phone number associated with a message UID."""
+    if ban(uid_arg, True):
+        _reply(
+            f"Phone # associated with message UID {uid_arg} has been "
+            "banned from sending messages."
+        )
+    else:
+        _reply(
+            f"Problem banning phone #. See logs for more information. UID: {uid_arg}"
+        )
+
+
+def _cmd_unban(uid_arg):
+    """Unban the phone number associated with a message UID."""
+    if ban(uid_arg, False):
+        _reply(
+            f"Phone # associated with message UID {uid_arg} has been "
+            "been UNBANNED from sending messages."
+        )
+    else:
+        _reply(
+            f"Problem unbanning phone #. See logs for more information. UID: {uid_arg}"
+        )
+
+
+def _cmd_stats(uid_arg):
+    """Display message statistics for the phone number associated with a message UID."""
+    stats = get_stats(uid_arg)
+    if stats:
+        # send_stats(stats)
+        pass
+    else:
+        _reply(
+            "Problem fetching message statistics. See logs for more information. "
+            f"UID: {uid_arg}"
+        )
+
+
+def _cmd_unknown(_uid_arg):
+    """Reply to an unrecognized command."""
+    _reply(_UNKNOWN_TEXT)
+
+
+# Command name -> handler, each taking the UID argument
+_COMMANDS = {
+    "!help": _cmd_help,
+    "!ping": _cmd_ping,
+    "!ban": _cmd_ban,
+    "!unban": _cmd_unban,
+    "!stats": _cmd_stats,
+}
+
 
 class CommandParser:
     """
@@ -34,7 +114,7 @@ class CommandParser:
         Returns:
         - None
         """
-        if not text.startswith("!"):
+        if text[:1] != "!":
             return
 
         command_parser = CommandParser(GroupMe)
@@ -50,87 +130,8 @@ class CommandParser:
         Returns:
         - None
         """
-        command = text.split(" ")[0].lower()
-        uid_arg = text.split(" ")[1] if len(text.split(" ")) > 1 else "NO_UID"
-
-        if command == "!help":
-            GroupMe.send_to_groupme(
-                {
-                    "text": (
-                        "Available commands:\n"
-                        "!help - Display this help message\n"
-                        "!ping - Check if the bot is online\n"
-                        "!ban <UID> - Ban a phone number from sending messages\n"
-                        "!unban <UID> - Unban a phone number from sending messages\n"
-                        "!stats <UID> - Display message statistics for a phone number"
-                    )
-                },
-                source="command_parser",
-            )
-        elif command == "!ping":
-            GroupMe.send_to_groupme(
-                {"text": f"Pong! UID: {uid_arg}"}, source="command_parser"
-            )
-        elif command == "!ban":
-            if ban(uid_arg, True):
-                GroupMe.send_to_groupme(
-                    {
-                        "text": f"Phone # associated with message UID {uid_arg} has been "
-                        "banned from sending messages."
-                    },
-                    source="command_parser",
-                )
-            else:
-                GroupMe.send_to_groupme(
-                    {
-                        "text": (
-                            "Problem banning phone #. See logs for more information. "
-                            f"UID: {uid_arg}"
-                        )
-                    },
-                    source="command_parser",
-                )
-        elif command == "!unban":
-            if ban(uid_arg, False):
-                GroupMe.send_to_groupme(
-                    {
-                        "text": f"Phone # associated with message UID {uid_arg} has been "
-                        "been UNBANNED from sending messages."
-                    },
-                    source="command_parser",
-                )
-            else:
-                GroupMe.send_to_groupme(
-                    {
-                        "text": (
-                            "Problem unbanning phone #. See logs for more information. "
-                            f"UID: {uid_arg}"
-                        )
-                    },
-                    source="command_parser",
-                )
-        elif command == "!stats":
-            stats = get_stats(uid_arg)
-            if stats:
-                # send_stats(stats)
-                pass
-            else:
-                GroupMe.send_to_groupme(
-                    {
-                        "text": (
-                            "Problem fetching message statistics. See logs for more information. "
-                            f"UID: {uid_arg}"
-                        )
-                    },
-                    source="command_parser",
-                )
-        else:
-            GroupMe.send_to_groupme(
-                {
-                    "text": (
-                        "Unknown command.\n\n"
-                        "Type `!help` to see a list of available commands."
-                    )
-                },
-                source="command_parser",
-            )
+        parts = text.split(" ", 2)
+        command = parts[0].lower()
+        uid_arg = parts[1] if len(parts) > 1 else "NO_UID"
+
+        _COMMANDS.get(command, _cmd_unknown)(uid_arg)
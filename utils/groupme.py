@@ -3,9 +3,16 @@ Module for handling GroupMe-specific message sending and processing.
 """
 
 import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.logging import configure_logging
 from utils.message import MessageUtils
+from utils.ratelimit import TokenBucket
 from rabbitmq.publisher import publish_log_pg
 from config import (
     GROUPCHAT_NAME,
@@ -14,10 +21,117 @@ from config import (
     GROUPME_BOT_ID,
     GROUPME_ACCESS_TOKEN,
     GROUPME_CHARACTER_LIMIT,
+    GROUPME_MAX_SEGMENTS,
 )
 
 logger = configure_logging(__name__)
 
+# Shared session so connections (to GroupMe and image hosts) are kept alive and reused
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            # Posting a message isn't idempotent: a retried POST could duplicate it in the chat
+            # if GroupMe had already accepted it. POSTs are only retried on failed connects (the
+            # request never left), and on 429 by `send_to_groupme` through the rate limiter.
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,  # Hand back the final response rather than raising
+        ),
+    ),
+)
+# Image uploads stream their body, which can't be replayed, so only retry failed connects
+_SESSION.mount(
+    GROUPME_IMAGE_API,
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.2
+        ),
+    ),
+)
+
+# (connect, read) timeouts in seconds: fail fast on unreachable hosts
+_TIMEOUT = (2, 15)
+# Image uploads are only answered once the whole image has been relayed from its source
+_IMAGE_UPLOAD_TIMEOUT = (2, 30)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Image content types accepted by GroupMe's image service, and their file extensions
+_MIME_TYPES = {
+    "image/gif": ".gif",
+    "image/jpeg": ".jpeg",
+    "image/png": ".png",
+}
+
+# Image upload headers for the default access token, by content type
+_IMAGE_HEADERS = {
+    content_type: {
+        "X-Access-Token": GROUPME_ACCESS_TOKEN,
+        "Content-Type": content_type,
+    }
+    for content_type in _MIME_TYPES
+}
+
+# Shared by every GroupMe request so concurrent messages can't exceed the rate together
+_RATE_LIMITER = TokenBucket(rate_per_sec=10)
+
+# How many times a rate-limited (429) message is re-sent, and the longest Retry-After honored
+_MAX_RATE_LIMIT_RETRIES = 3
+_MAX_RETRY_AFTER = 10.0
+
+# Worker threads for GroupMe requests that don't need to complete in order
+_HTTP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gm-http")
+
+
+class _HashingStream:
+    """
+    Iterate over a streamed response body in chunks, hashing and measuring it on the way
+    through, so an image can be forwarded without ever being held in memory as a whole.
+    """
+
+    def __init__(self, response, chunk_size=64 * 1024):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.response.iter_content(self.chunk_size):
+            self.sha256.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    def __len__(self):
+        """
+        Declared length of the body, so requests can send a Content-Length header.
+        0 (sent chunked instead) if unknown, malformed, or if the body is decoded on the way
+        through.
+        """
+        if self.response.headers.get("Content-Encoding"):
+            return 0
+        try:
+            length = int(self.response.headers.get("Content-Length") or 0)
+        except ValueError:
+            # e.g. "abc", or repeated headers merged as "10, 10"
+            return 0
+        return max(length, 0)
+
+    def __bool__(self):
+        """
+        Always truthy, even when `__len__` is 0: requests replaces a falsy `data` with `{}`,
+        which would upload an empty body.
+        """
+        return True
+
 
 class GroupMe:
     """
@@ -31,6 +145,24 @@ class GroupMe:
         """
         return uid.split("-", 1)[0]
 
+    @staticmethod
+    def retry_after(response):
+        """
+        Get how long to wait before retrying a rate-limited request.
+
+        Parameters:
+        - response (requests.Response): The 429 response
+
+        Returns:
+        - float: The Retry-After delay in seconds (capped at _MAX_RETRY_AFTER), or 1 second if
+            the header is missing or not a number of seconds
+        """
+        try:
+            delay = float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            delay = 1.0
+        return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
     @staticmethod
     def upload_image(
         image_url, source, uid, access_token=GROUPME_ACCESS_TOKEN, bot_id=GROUPME_BOT_ID
@@ -52,106 +184,154 @@ class GroupMe:
         - ValueError: If the image file type is unsupported
         - Exception: If the image fails to download from Twilio
         """
-        mime_types = {
-            "image/gif": ".gif",
-            "image/jpeg": ".jpeg",
-            "image/png": ".png",
-        }
-
         try:
             # Download image from the URL
-            image_response = requests.get(image_url, stream=True, timeout=10)
-            if image_response.status_code != 200:
-                raise requests.exceptions.RequestException(
-                    f"Failed to download image from {image_url}: \
-                    {image_response.status_code}"
-                )
+            # (closing the response returns its connection to the session's pool)
+            with _SESSION.get(
+                image_url, stream=True, timeout=_TIMEOUT
+            ) as image_response:
+                if image_response.status_code != 200:
+                    raise requests.exceptions.RequestException(
+                        f"Failed to download image from {image_url}: \
+                        {image_response.status_code}"
+                    )
 
-            content_type = image_response.headers.get("Content-Type", "").lower()
-            file_extension = mime_types.get(content_type)
+                content_type = image_response.headers.get("Content-Type", "").lower()
+                file_extension = _MIME_TYPES.get(content_type)
 
-            if not file_extension:
-                logger.warning(
-                    "Unsupported content type `%s`. "
-                    "Must be one of: image/gif, image/jpeg, image/png",
-                    content_type,
+                if not file_extension:
+                    logger.warning(
+                        "Unsupported content type `%s`. "
+                        "Must be one of: image/gif, image/jpeg, image/png",
+                        content_type,
+                    )
+                    return None
+
+                if access_token == GROUPME_ACCESS_TOKEN:
+                    headers = _IMAGE_HEADERS[content_type]
+                else:
+                    headers = {
+                        "X-Access-Token": access_token,
+                        "Content-Type": content_type,
+                    }
+
+                # Stream the image to GroupMe as it downloads
+                image_stream = _HashingStream(image_response)
+                response = _SESSION.post(
+                    GROUPME_IMAGE_API,
+                    headers=headers,
+                    data=image_stream,
+                    timeout=_IMAGE_UPLOAD_TIMEOUT,
                 )
-                return None
-
-            headers = {
-                "X-Access-Token": access_token,
-                "Content-Type": content_type,
-            }
-
-            # Upload the downloaded image to GroupMe
-            response = requests.post(
-                GROUPME_IMAGE_API,
-                headers=headers,
-                data=image_response.content,
-                timeout=10,
-            )
 
-            if response.status_code == 200:
-                logger.debug("Image upload successful: %s", response.json())
-
-                # Log the API interaction in Postgres
+                # Log a fingerprint of the image rather than its bytes
+                image_log = {
+                    "sha256": image_stream.sha256.hexdigest(),
+                    "size": image_stream.size,
+                    "content_type": content_type,
+                    "bot_id": bot_id,
+                    "text": "",  # Empty text for image uploads
+                }
+
+                if image_stream.size == 0:
+                    logger.warning(
+                        "Image from %s was uploaded with an empty body", image_url
+                    )
+                    return None
+
+                if response.status_code == 200:
+                    upload_result = response.json()
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Image upload successful: %s", upload_result)
+
+                    # Log the API interaction in Postgres
+                    publish_log_pg(
+                        body=image_log,
+                        source=source,
+                        statuscode=response.status_code,
+                        uid=uid,
+                        routing_key="groupme.img",
+                        sub_key="img",
+                    )
+                    return upload_result
+                logger.warning(
+                    "Image upload failed: %s - %s", response.status_code, response.text
+                )
                 publish_log_pg(
-                    body={
-                        "raw_img": str(image_response.content),
-                        "bot_id": bot_id,
-                        "text": "",  # Empty text for image uploads
-                    },  # Wrap bytes in a dictionary
-                    source=source,
-                    statuscode=response.status_code,
-                    uid=uid,
+                    image_log,
+                    source,
+                    response.status_code,
+                    uid,
                     routing_key="groupme.img",
                     sub_key="img",
                 )
-                return response.json()
-            logger.warning(
-                "Image upload failed: %s - %s", response.status_code, response.text
-            )
-            publish_log_pg(
-                image_response.content,
-                source,
-                response.status_code,
-                uid,
-                routing_key="groupme.img",
-                sub_key="img",
-            )
-            return None
-        except requests.exceptions.RequestException as e:
+                return None
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(
                 "Exception occurred while uploading image %s: %s", image_url, e
             )
             return None
 
+    @staticmethod
+    def upload_images_bulk(image_urls, source, uid):
+        """
+        Upload several images to GroupMe's image service concurrently.
+
+        Parameters:
+        - image_urls (list): The URLs of the images to upload
+        - source (str): The source of the images
+        - uid (str): The unique message ID (generated by message originator)
+
+        Returns:
+        - list: The result of `upload_image` for each URL, in the same order
+        """
+        futures = [
+            _HTTP_POOL.submit(GroupMe.upload_image, image_url, source, uid)
+            for image_url in image_urls
+        ]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def count_segments(body):
+        """
+        Count the segments `split_message` will produce for a message body.
+
+        Parameters:
+        - body (str): The message string
+
+        Returns:
+        - int: The number of segments
+        """
+        return (len(body) + GROUPME_CHARACTER_LIMIT - 1) // GROUPME_CHARACTER_LIMIT
+
     @staticmethod
     def split_message(body):
         """
         Split a message body string if it exceeds GroupMe's character limit.
+        Segments are yielded lazily rather than collected into a list, and are already stripped
+        of surrounding whitespace.
+
+        The limit is in characters, so segments are sliced from the string itself; slicing its
+        UTF-8 bytes instead could split a multibyte character.
 
         Parameters:
         - body (str): The message string
 
-        Returns:
-        - list: A list of message segment strings
+        Yields:
+        - str: Each message segment string
         """
-        segments = [
-            body[i : i + GROUPME_CHARACTER_LIMIT].strip()
-            for i in range(0, len(body), GROUPME_CHARACTER_LIMIT)
-        ]
-        return segments
+        for i in range(0, len(body), GROUPME_CHARACTER_LIMIT):
+            yield body[i : i + GROUPME_CHARACTER_LIMIT].strip()
 
     @staticmethod
-    def send_text_segments(segments, source, uid, num_media=0):
+    def send_text_segments(body, source, uid, num_media=0):
         """
-        Send each text segment to GroupMe.
+        Split a message body and send each text segment to GroupMe.
         Pre-process the text to include segment labels (if applicable) and an end marker.
-        A delay is added between each segment to prevent rate limiting.
+        Bodies longer than GROUPME_MAX_SEGMENTS segments are truncated (ending in an ellipsis).
 
         Parameters:
-        - segments (list): A list of message segment strings
+        - body (str): The message string
         - source (str): The source of the message
         - uid (str): The unique message ID (generated by message originator)
         - num_media (int): The number of media items being sent with the message
@@ -159,27 +339,50 @@ class GroupMe:
         Returns:
         - None
         """
-        total_segments = len(segments)
-        for index, segment in enumerate(segments, start=1):
-            segment_label = (
-                f"({index}/{total_segments}):\n" if total_segments > 1 else ""
+        max_length = GROUPME_MAX_SEGMENTS * GROUPME_CHARACTER_LIMIT
+        if len(body) > max_length:
+            logger.warning(
+                "Message %s is %d characters long; truncating to %d segments",
+                uid,
+                len(body),
+                GROUPME_MAX_SEGMENTS,
             )
-
-            # Determine media description (item vs items) and add to the last segment if applicable
-            if num_media > 0 and index == total_segments:
-                media_description = "item" if num_media == 1 else "items"
-                media_info = f"\n{num_media} media {media_description} attached"
-            else:
-                media_info = ""
-
-            end_marker = (
-                f"\n---UID---\n{GroupMe.abbreviate_uid(uid)}{media_info}\n---------"
-                if index == total_segments
-                else ""
+            body = body[: max_length - 1] + "\u2026"
+
+        total_segments = GroupMe.count_segments(body)
+
+        # Determine media description (item vs items) for the last segment, if applicable
+        if num_media > 0:
+            media_description = "item" if num_media == 1 else "items"
+            media_info = f"\n{num_media} media {media_description} attached"
+        else:
+            media_info = ""
+        end_marker = (
+            f"\n---UID---\n{GroupMe.abbreviate_uid(uid)}{media_info}\n---------"
+        )
+
+        # Most messages fit in one segment: send it without labels or splitting
+        if total_segments == 1:
+            segment = body.strip()
+            GroupMe.send_to_groupme(
+                {"text": f'"{segment}"{end_marker}'}, source, uid=uid
+            )
+            logger.debug("`%s`: Text sent for %s: %s", source, uid, segment)
+            return
+
+        # One request body is reused for every segment: send_to_groupme serializes it (and
+        # snapshots it for logging) before returning, so only the text needs replacing
+        data = {"text": "", "bot_id": GROUPME_BOT_ID}
+        for index, segment in enumerate(GroupMe.split_message(body), start=1):
+            data["text"] = "".join(
+                (
+                    f"({index}/{total_segments}):\n",
+                    '"',
+                    segment,
+                    '"',
+                    end_marker if index == total_segments else "",
+                )
             )
-            data = {
-                "text": f'{segment_label}"{segment.strip()}"{end_marker}',
-            }
             GroupMe.send_to_groupme(data, source, uid=uid)
             logger.debug(
                 "`%s`: Text segment (%d/%d) sent for %s: %s",
@@ -189,13 +392,14 @@ class GroupMe:
                 uid,
                 segment,
             )
-            time.sleep(0.1)  # Rate limit to prevent GroupMe API rate limiting
 
     @staticmethod
     def send_images(images, source, uid, body_provided):
         """
         Send images to GroupMe if any are present.
-        A delay is added between each image to prevent rate limiting.
+        Images are posted concurrently (still subject to the shared rate limit), so the next
+        image doesn't wait for the previous one's response. Images may therefore appear in the
+        chat out of order.
 
         Parameters:
         - images (list): A list of GroupMe image service URLs
@@ -208,14 +412,20 @@ class GroupMe:
         Returns:
         - None
         """
+        futures = []
         for image_url in images:
             # Construct body for image sending
             image_data = {
                 "picture_url": image_url,
                 "text": "",
             }
-            GroupMe.send_to_groupme(image_data, source, uid)
-            time.sleep(0.1)
+            futures.append(
+                _HTTP_POOL.submit(GroupMe.send_to_groupme, image_data, source, uid)
+            )
+
+        # Wait for every image before the UID marker, re-raising any request failure
+        for future in futures:
+            future.result()
 
         if not body_provided:
             # If no text body is provided, then UID is not included in the image message
@@ -229,17 +439,19 @@ class GroupMe:
             )
 
     @staticmethod
-    def send_to_groupme(
-        body, source, uid=MessageUtils.gen_uuid(), bot_id=GROUPME_BOT_ID
-    ):
+    def send_to_groupme(body, source, uid=None, bot_id=GROUPME_BOT_ID):
         """
         Make the actual HTTP POST request to GroupMe API. Logs the request in Postgres.
+        Waits as needed to stay within the rate limit shared by all GroupMe requests.
+        If GroupMe rate limits the request (429), it is re-sent after its Retry-After delay,
+        taking a fresh token from the shared limiter each time.
 
         Parameters:
         - body (dict): The message body to send.
             Assumes it is constructed, only needs the bot ID.
         - source (str): The source of the message
-        - uid (str): The unique message ID (generated by message originator)
+        - uid (str, optional): The unique message ID (generated by message originator)
+            - If not provided, a new UID is generated for this request
         - bot_id (str): The GroupMe bot ID from the group to send the message to
 
         Returns:
@@ -248,10 +460,28 @@ class GroupMe:
         Throws:
         - requests.exceptions.RequestException: If the HTTP POST request fails
         """
+        if uid is None:
+            uid = MessageUtils.gen_uuid()
         body["bot_id"] = bot_id
 
         try:
-            response = requests.post(GROUPME_API, json=body, timeout=10)
+            data = orjson.dumps(body)
+            for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+                _RATE_LIMITER.acquire()
+                response = _SESSION.post(
+                    GROUPME_API,
+                    data=data,
+                    headers=_JSON_HEADERS,
+                    timeout=_TIMEOUT,
+                )
+                # A 429 means GroupMe didn't accept the message, so it's safe to re-send
+                if response.status_code != 429 or attempt == _MAX_RATE_LIMIT_RETRIES:
+                    break
+                delay = GroupMe.retry_after(response)
+                logger.warning(
+                    "Rate limited by GroupMe, retrying in %.1f seconds: %s", delay, uid
+                )
+                time.sleep(delay)
 
             if response.status_code in {200, 202}:
                 if body.get("text"):
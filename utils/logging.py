@@ -3,9 +3,12 @@ Logging module.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
+from zoneinfo import ZoneInfo
 from colorlog import ColoredFormatter
-import pytz
+from config import LOG_LEVEL
+
+_EASTERN = ZoneInfo("America/New_York")
 
 
 def configure_logging(logger_name="wbor_groupme"):
@@ -17,21 +20,17 @@ def configure_logging(logger_name="wbor_groupme"):
         # Avoid re-adding handlers if the logger is already configured
         return logger
 
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
 
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
+    console_handler.setLevel(LOG_LEVEL)
 
     class EasternTimeFormatter(ColoredFormatter):
         """Custom log formatter to display timestamps in Eastern Time with colorized output"""
 
         def formatTime(self, record, datefmt=None):
-            # Convert UTC to Eastern Time
-            eastern = pytz.timezone("America/New_York")
-            utc_dt = datetime.fromtimestamp(record.created, tz=timezone.utc)
-            eastern_dt = utc_dt.astimezone(eastern)
-            # Use ISO 8601 format
-            return eastern_dt.isoformat()
+            # Convert the record's timestamp directly to Eastern Time, in ISO 8601 format
+            return datetime.fromtimestamp(record.created, tz=_EASTERN).isoformat()
 
     # Define the formatter with color and PID
     formatter = EasternTimeFormatter(
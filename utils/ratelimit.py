@@ -0,0 +1,44 @@
+"""
+Rate limiting for outbound API requests.
+"""
+
+import time
+import random
+import threading
+
+
+class TokenBucket:
+    """
+    A thread-safe token-bucket rate limiter.
+
+    Uses the monotonic clock, so wall-clock adjustments can't cause bursts or stalls. Each
+    caller reserves the next free slot while holding the lock, then sleeps (outside the lock)
+    only for whatever part of the interval hasn't already elapsed.
+    """
+
+    def __init__(self, rate_per_sec, burst=1, jitter=0.02):
+        """
+        Parameters:
+        - rate_per_sec (float): The sustained number of requests allowed per second
+        - burst (int): The number of requests allowed back-to-back after an idle period
+        - jitter (float): The maximum random delay (in seconds) added to any wait
+        """
+        self.interval = 1.0 / rate_per_sec
+        self.burst = burst
+        self.jitter = jitter
+        self._next_available = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a request may be made.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Slots left unused while idle accrue, up to `burst`
+            slot = max(self._next_available, now - (self.burst - 1) * self.interval)
+            self._next_available = slot + self.interval
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait + random.uniform(0, self.jitter))